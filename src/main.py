@@ -1,58 +1,243 @@
+import logging
 import sys
-import argparse
 from src.version_manager import VersionManager
 
+USAGE = """usage: version-manager [-h] [--increment {x,y,z}] [--reset-z] [--get-tag]
+                      [--get-version] [--set-x SET_X] [--set-y SET_Y]
+                      [--set-z SET_Z] [--storage-type {file,dynamodb,s3}]
+                      [--version-file VERSION_FILE]
+                      [--dynamodb-table DYNAMODB_TABLE]
+                      [--s3-bucket S3_BUCKET] [--s3-prefix S3_PREFIX]
+                      [--batch FILE]
+"""
 
-def main():
-    """Command-line interface for version manager."""
-    parser = argparse.ArgumentParser(description="Version Manager for CI/CD")
-    parser.add_argument("--increment", choices=["x", "y", "z"],
-                        help="Increment specific version component")
-    parser.add_argument("--reset-z", action="store_true",
-                        help="Reset Z component to 0")
-    parser.add_argument("--get-tag", action="store_true",
-                        help="Generate and print full image tag")
-    parser.add_argument("--get-version", action="store_true",
-                        help="Print current version string")
-    parser.add_argument("--set-x", type=int, help="Set X component value")
-    parser.add_argument("--set-y", type=int, help="Set Y component value")
-    parser.add_argument("--set-z", type=int, help="Set Z component value")
+HELP = USAGE + """
+Version Manager for CI/CD
+
+optional arguments:
+  -h, --help            show this help message and exit
+  --increment {x,y,z}   Increment specific version component
+  --reset-z             Reset Z component to 0
+  --get-tag             Generate and print full image tag
+  --get-version         Print current version string
+  --set-x SET_X         Set X component value
+  --set-y SET_Y         Set Y component value
+  --set-z SET_Z         Set Z component value
+  --storage-type {file,dynamodb,s3}
+                        Storage type for version data
+  --version-file VERSION_FILE
+                        Path to version file
+  --dynamodb-table DYNAMODB_TABLE
+                        DynamoDB table name
+  --s3-bucket S3_BUCKET
+                        S3 bucket name
+  --s3-prefix S3_PREFIX
+                        S3 key prefix
+  --batch FILE          Run commands from FILE ('-' for stdin), one per line:
+                        increment {x,y,z}, reset-z, set-x N, set-y N, set-z N,
+                        get-tag, get-version
+"""
+
+# flag -> (attribute, kind, choices)
+OPTIONS = {
+    "--increment": ("increment", "choice", ("x", "y", "z")),
+    "--reset-z": ("reset_z", "store_true", None),
+    "--get-tag": ("get_tag", "store_true", None),
+    "--get-version": ("get_version", "store_true", None),
+    "--set-x": ("set_x", "int", None),
+    "--set-y": ("set_y", "int", None),
+    "--set-z": ("set_z", "int", None),
 
     # Storage options
-    parser.add_argument("--storage-type", choices=["file", "dynamodb", "s3"],
-                        default="file", help="Storage type for version data")
-    parser.add_argument("--version-file", help="Path to version file")
-    parser.add_argument("--dynamodb-table", help="DynamoDB table name")
-    parser.add_argument("--s3-bucket", help="S3 bucket name")
-    parser.add_argument("--s3-prefix", help="S3 key prefix")
+    "--storage-type": ("storage_type", "choice", ("file", "dynamodb", "s3")),
+    "--version-file": ("version_file", "str", None),
+    "--dynamodb-table": ("dynamodb_table", "str", None),
+    "--s3-bucket": ("s3_bucket", "str", None),
+    "--s3-prefix": ("s3_prefix", "str", None),
+    "--batch": ("batch", "str", None),
+}
+
+DEFAULTS = {
+    "increment": None,
+    "reset_z": False,
+    "get_tag": False,
+    "get_version": False,
+    "set_x": None,
+    "set_y": None,
+    "set_z": None,
+    "storage_type": "file",
+    "version_file": None,
+    "dynamodb_table": None,
+    "s3_bucket": None,
+    "s3_prefix": None,
+    "batch": None,
+}
+
+
+class Args:
+    """Parsed command-line options, exposed as attributes."""
+
+    def __init__(self, values):
+        self.__dict__.update(values)
+
+
+def _error(message):
+    """Print usage and an error message to stderr, then exit like argparse does."""
+    sys.stderr.write(USAGE)
+    sys.stderr.write(f"version-manager: error: {message}\n")
+    sys.exit(2)
+
+
+def parse_args(argv):
+    """Parse command-line flags in a single pass over argv."""
+    values = dict(DEFAULTS)
+    i = 0
+    n = len(argv)
+    while i < n:
+        arg = argv[i]
+        i += 1
+        if arg in ("-h", "--help"):
+            sys.stdout.write(HELP)
+            sys.exit(0)
+
+        flag, sep, value = arg.partition("=")
+        option = OPTIONS.get(flag)
+        if option is None:
+            _error(f"unrecognized arguments: {arg}")
+        attr, kind, choices = option
+
+        if kind == "store_true":
+            if sep:
+                _error(f"argument {flag}: ignored explicit argument '{value}'")
+            values[attr] = True
+            continue
+
+        if not sep:
+            # Like argparse, a following flag is not taken as this flag's value
+            if i >= n or argv[i] in ("-h", "--help") or argv[i].partition("=")[0] in OPTIONS:
+                _error(f"argument {flag}: expected one argument")
+            value = argv[i]
+            i += 1
+
+        if kind == "int":
+            try:
+                value = int(value)
+            except ValueError:
+                _error(f"argument {flag}: invalid int value: '{value}'")
+        elif kind == "choice" and value not in choices:
+            allowed = ", ".join(f"'{c}'" for c in choices)
+            _error(f"argument {flag}: invalid choice: '{value}' (choose from {allowed})")
 
-    args = parser.parse_args()
+        values[attr] = value
 
-    # Initialize version manager
+    return Args(values)
+
+
+def run_batch(version_manager, lines):
+    """
+    Run batch commands against a single version manager.
+
+    Blank lines and lines starting with '#' are skipped. Nothing is saved here;
+    the caller saves once after all commands ran.
+
+    Returns:
+        list: Lines to print, in the order they were requested
+    """
+    output = []
+    for number, line in enumerate(lines, 1):
+        words = line.split()
+        if not words or words[0].startswith("#"):
+            continue
+        command, params = words[0], words[1:]
+
+        if command == "increment" and len(params) == 1 and params[0] in ("x", "y", "z"):
+            getattr(version_manager, f"increment_{params[0]}")()
+        elif command == "reset-z" and not params:
+            version_manager.reset_z()
+        elif command in ("set-x", "set-y", "set-z") and len(params) == 1:
+            try:
+                value = int(params[0])
+            except ValueError:
+                _error(f"batch line {number}: invalid int value: '{params[0]}'")
+            version_manager.set_version(**{command[-1]: value})
+        elif command == "get-tag" and not params:
+            output.append(version_manager.generate_image_tag())
+        elif command == "get-version" and not params:
+            output.append(version_manager.get_version_string())
+        else:
+            _error(f"batch line {number}: invalid command: '{line.strip()}'")
+    return output
+
+
+def main(argv=None):
+    """Command-line interface for version manager."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    has_actions = (args.get_tag or args.get_version or args.increment or args.reset_z
+                   or args.set_x is not None or args.set_y is not None
+                   or args.set_z is not None)
+    if args.batch is not None and has_actions:
+        _error("argument --batch: not allowed with version action arguments")
+
+    # Nothing to read or change: don't touch the storage at all
+    if not has_actions and args.batch is None:
+        return 0
+
+    # Initialize version manager; the version is loaded on first use
     version_manager = VersionManager(
         storage_type=args.storage_type,
         version_file=args.version_file,
         dynamodb_table=args.dynamodb_table,
         s3_bucket=args.s3_bucket,
-        s3_prefix=args.s3_prefix
+        s3_prefix=args.s3_prefix,
+        lazy_load=True
     )
 
+    # Batch mode: all commands share one load and one save
+    if args.batch is not None:
+        if args.batch == "-":
+            output = run_batch(version_manager, sys.stdin)
+        else:
+            with open(args.batch) as f:
+                output = run_batch(version_manager, f)
+        version_manager.save_version()
+        for line in output:
+            print(line)
+        return 0
+
     # Apply version changes
+    dirty = False
     if args.set_x is not None or args.set_y is not None or args.set_z is not None:
         version_manager.set_version(args.set_x, args.set_y, args.set_z)
+        dirty = True
 
     if args.increment == "x":
         version_manager.increment_x()
+        dirty = True
     elif args.increment == "y":
         version_manager.increment_y()
+        dirty = True
     elif args.increment == "z":
-        version_manager.increment_z()
+        if not dirty and not args.reset_z:
+            # Sole mutation: let the storage apply and persist it atomically
+            version_manager.increment_z_remote()
+        else:
+            version_manager.increment_z()
+            dirty = True
 
     if args.reset_z:
         version_manager.reset_z()
+        dirty = True
 
-    # Save updated version
-    version_manager.save_version()
+    # Save updated version only when something was changed
+    if dirty:
+        version_manager.save_version()
 
     # Generate and print tag if requested
     if args.get_tag:
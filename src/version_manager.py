@@ -4,30 +4,178 @@ Version Manager for Bitbucket Pipelines CI/CD.
 This module handles version management according to semantic versioning principles.
 """
 
-import json
+import functools
 import os
-from datetime import datetime
-import boto3
+from collections.abc import Mapping
+import time
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import orjson
+
+    def _json_dumps(data, indent=False):
+        """Serialize data to JSON bytes."""
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(data, indent=False):
+        """Serialize data to JSON bytes."""
+        return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+    _json_loads = json.loads
+
 logger = logging.getLogger('version_manager')
 
 # Default version file if using local file storage
 DEFAULT_VERSION_FILE = "version.json"
 
+# Versions already loaded in this process, keyed by storage location.
+# File entries are validated against the file's mtime and size; S3 and DynamoDB
+# entries are only served within VERSION_CACHE_TTL seconds (0 disables them).
+_LOAD_CACHE: dict[tuple, tuple] = {}
+
+
+def _get_cache_ttl():
+    """Get VERSION_CACHE_TTL in seconds, treating invalid values as 0 (caching disabled)."""
+    value = os.environ.get("VERSION_CACHE_TTL", 0)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        logger.warning("Invalid VERSION_CACHE_TTL %r, remote load caching disabled", value)
+        return 0.0
+
+
+def _utc_timestamp():
+    """Get the current UTC time as an ISO 8601 string, e.g. 2024-01-31T12:00:00Z."""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+
+def _get_repo_identifier():
+    """Get a unique identifier for the repository."""
+    env = os.environ
+
+    # Try to get from Bitbucket environment variables
+    repo_slug = env.get("BITBUCKET_REPO_SLUG")
+    if repo_slug is not None:
+        workspace = env.get("BITBUCKET_WORKSPACE", "default")
+        return f"{workspace}/{repo_slug}"
+
+    # Fall back to local directory name
+    return os.path.basename(os.getcwd())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client_config():
+    """Get the shared botocore config with connection reuse enabled."""
+    from botocore.config import Config
+    return Config(max_pool_connections=10, tcp_keepalive=True,
+                  retries={'max_attempts': 3, 'mode': 'adaptive'})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_s3_client(credentials):
+    """Get an S3 client for the given credentials, reused across calls."""
+    import boto3
+    aws_access_key_id, aws_secret_access_key, aws_session_token = credentials
+    return boto3.client('s3',
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        aws_session_token=aws_session_token,
+                        config=_get_client_config())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_dynamodb_resource(credentials):
+    """Get a DynamoDB resource for the given credentials, reused across calls."""
+    import boto3
+    aws_access_key_id, aws_secret_access_key, aws_session_token = credentials
+    return boto3.resource('dynamodb',
+                          aws_access_key_id=aws_access_key_id,
+                          aws_secret_access_key=aws_secret_access_key,
+                          aws_session_token=aws_session_token,
+                          config=_get_client_config())
+
+
+class _Version:
+    """The x.y.z version components, stored in slots for cheap attribute access."""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a version from its JSON/DynamoDB dict representation.
+
+        Missing components get their defaults and values are coerced to int, so
+        partially written data and DynamoDB Decimals don't break the arithmetic.
+        """
+        if not isinstance(data, Mapping):
+            data = {}
+        return cls(int(data.get("x", 1)), int(data.get("y", 0)), int(data.get("z", 0)))
+
+    def as_dict(self):
+        """Get the dict representation used for storage."""
+        return {"x": self.x, "y": self.y, "z": self.z}
+
+    def __repr__(self):
+        return repr(self.as_dict())
+
+
+class _VersionData(dict):
+    """
+    The version as a plain dict snapshot whose item assignments also update the manager.
+
+    Being a real dict keeps it JSON serializable and copyable; methods that would
+    remove a component raise TypeError.
+    """
+
+    __slots__ = ('_manager',)
+
+    def __init__(self, manager):
+        super().__init__(manager._load().as_dict())
+        self._manager = manager
+
+    def __setitem__(self, key, value):
+        if key not in ('x', 'y', 'z'):
+            raise KeyError(key)
+        setattr(self._manager._load(), key, value)
+        self._manager._pending = True
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def _remove(self, *args):
+        raise TypeError("version components cannot be removed")
+
+    __delitem__ = pop = popitem = clear = _remove
+
 
 class VersionManager:
     """Manager for handling semantic versioning across repositories."""
 
+    __slots__ = ('storage_type', 'version_file', 'dynamodb_table', 's3_bucket', 's3_prefix',
+                 'aws_access_key_id', 'aws_secret_access_key', 'aws_session_token',
+                 'repo_id', '_v', '_loaded_version', '_pending', '_dynamodb_table_obj',
+                 '_project_name', '_commit_hash8')
+
     def __init__(self, storage_type: str = "file", version_file: str = None,
                  dynamodb_table: str = None, s3_bucket: str = None, s3_prefix: str = None,
                  aws_access_key_id: str = None, aws_secret_access_key: str = None,
-                 aws_session_token: str = None):
+                 aws_session_token: str = None, lazy_load: bool = False):
         """
         Initialize the version manager.
 
@@ -37,6 +185,7 @@ class VersionManager:
             dynamodb_table (str): DynamoDB table name if using DynamoDB storage
             s3_bucket (str): S3 bucket name if using S3 storage
             s3_prefix (str): S3 key prefix if using S3 storage
+            lazy_load (bool): Defer loading the version until it is first needed
         """
         self.storage_type = storage_type
         self.version_file = version_file or DEFAULT_VERSION_FILE
@@ -47,49 +196,134 @@ class VersionManager:
         self.aws_secret_access_key = aws_secret_access_key
         self.aws_session_token = aws_session_token
 
+        # AWS handles are created on first use so file storage never imports boto3
+        self._dynamodb_table_obj = None
+
         # Get repository identifier
         self.repo_id = self._get_repo_identifier()
 
+        # Image tag components that don't change during the process lifetime.
+        # Use repository slug if available, fallback to env var or default
+        env = os.environ
+        project_name = env.get("BITBUCKET_REPO_SLUG")
+        if project_name is None:
+            project_name = env.get("PROJECT_NAME", "python-app")
+        self._project_name = project_name
+        self._commit_hash8 = env.get("BITBUCKET_COMMIT", "local")[:8]
+
         # Initialize version data
-        self.version_data = self.load_version()
+        self._v = None
+        self._loaded_version = None
+
+        # Set by the mutation methods; save_version() only writes when True
+        self._pending = False
+
+        if not lazy_load:
+            self._load()
 
     def _get_repo_identifier(self):
         """Get a unique identifier for the repository."""
-        # Try to get from Bitbucket environment variables
-        if "BITBUCKET_REPO_SLUG" in os.environ:
-            repo_slug = os.environ.get("BITBUCKET_REPO_SLUG")
-            workspace = os.environ.get("BITBUCKET_WORKSPACE", "default")
-            return f"{workspace}/{repo_slug}"
+        return _get_repo_identifier()
+
+    def _get_dynamodb_table(self):
+        """Get the DynamoDB table handle, creating it on first use."""
+        if self._dynamodb_table_obj is None:
+            dynamodb = _get_dynamodb_resource(self._aws_credentials())
+            self._dynamodb_table_obj = dynamodb.Table(self.dynamodb_table)
+        return self._dynamodb_table_obj
+
+    def _aws_credentials(self):
+        """Get the AWS credentials as a hashable tuple for the client caches."""
+        return (self.aws_access_key_id, self.aws_secret_access_key, self.aws_session_token)
+
+    def _load(self):
+        """Get the current version, loading it from storage on first use."""
+        if self._v is None:
+            self._v = self._version_from_storage(self.load_version())
+            self._loaded_version = self._version_tuple()
+        return self._v
+
+    def _version_from_storage(self, data):
+        """Build the version from stored data, using the default if it can't be normalized."""
+        try:
+            return _Version.from_dict(data)
+        except (TypeError, ValueError):
+            logger.warning("Invalid version data %s, using default version", data)
+            return _Version.from_dict(self._get_default_version())
+
+    @property
+    def version_data(self):
+        """
+        Get the version as a dict with 'x', 'y' and 'z' keys.
+
+        The dict is a snapshot that later mutations don't change. Item
+        assignments on it write through to the manager and, like assigning the
+        whole attribute, are persisted by the next save_version().
+        """
+        return _VersionData(self)
+
+    @version_data.setter
+    def version_data(self, data):
+        self._v = _Version.from_dict(data)
+        self._pending = True
 
-        # Fall back to local directory name
-        import pathlib
-        return pathlib.Path(os.getcwd()).name
+    def _version_tuple(self):
+        """Get the current version components to detect unsaved changes."""
+        v = self._v
+        return (v.x, v.y, v.z)
+
+    def _cache_key(self):
+        """Get the key identifying this manager's storage location in the load cache."""
+        return (self.storage_type, self.version_file, self.s3_bucket, self.s3_prefix,
+                self.dynamodb_table, self.repo_id)
 
     def load_version(self):
-        """Load version data from the configured storage."""
+        """Load version data from the configured storage, reusing earlier loads."""
         if self.storage_type == "file":
             return self._load_from_file()
-        elif self.storage_type == "dynamodb":
-            return self._load_from_dynamodb()
-        elif self.storage_type == "s3":
-            return self._load_from_s3()
-        else:
+        elif self.storage_type not in ("dynamodb", "s3"):
             raise ValueError(f"Unsupported storage type: {self.storage_type}")
 
+        cached = _LOAD_CACHE.get(self._cache_key())
+        ttl = _get_cache_ttl()
+        if ttl > 0 and cached is not None and time.monotonic() - cached[0] < ttl:
+            logger.info("Loaded version from cache: %s", cached[1])
+            return dict(cached[1])
+
+        # The loaders cache only what they actually read, never a fallback default
+        if self.storage_type == "dynamodb":
+            return self._load_from_dynamodb()
+        return self._load_from_s3()
+
+    def _cache_remote_load(self, version_data):
+        """Remember version data read from S3 or DynamoDB for VERSION_CACHE_TTL seconds."""
+        _LOAD_CACHE[self._cache_key()] = (time.monotonic(), dict(version_data))
+
     def _load_from_file(self):
-        """Load version from a local file."""
-        if os.path.exists(self.version_file):
-            try:
-                with open(self.version_file, 'r') as f:
-                    version_data = json.load(f)
-                    logger.info(f"Loaded version from file: {version_data}")
-                    return version_data
-            except json.JSONDecodeError:
-                logger.warning(f"Error parsing {self.version_file}, creating new version")
+        """Load version from a local file, reusing the cached copy if the file is unchanged."""
+        try:
+            with open(self.version_file, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                key = self._cache_key()
+                cached = _LOAD_CACHE.get(key)
+                if cached is not None and cached[0] == stamp:
+                    logger.info("Loaded version from cache: %s", cached[1])
+                    return dict(cached[1])
+                version_data = _json_loads(f.read())
+            if not isinstance(version_data, dict):
+                raise ValueError("version data must be a JSON object")
+            logger.info("Loaded version from file: %s", version_data)
+            _LOAD_CACHE[key] = (stamp, dict(version_data))
+            return version_data
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            logger.warning("Error parsing %s, creating new version", self.version_file)
 
         # Create default version
         default_version = self._get_default_version()
-        logger.info(f"Using default version: {default_version}")
+        logger.info("Using default version: %s", default_version)
         return default_version
 
     def _load_from_dynamodb(self):
@@ -98,25 +332,22 @@ class VersionManager:
             raise ValueError("DynamoDB table name is required for DynamoDB storage")
 
         try:
-            dynamodb = boto3.resource('dynamodb',
-                                      aws_access_key_id=self.aws_access_key_id,
-                                      aws_secret_access_key=self.aws_secret_access_key,
-                                      aws_session_token=self.aws_session_token)
-            table = dynamodb.Table(self.dynamodb_table)
+            table = self._get_dynamodb_table()
             response = table.get_item(Key={'repo_id': self.repo_id})
 
             if 'Item' in response:
                 version_data = response['Item'].get('version_data', {})
-                logger.info(f"Loaded version from DynamoDB: {version_data}")
+                logger.info("Loaded version from DynamoDB: %s", version_data)
+                self._cache_remote_load(version_data)
                 return version_data
 
             # Create default version
             default_version = self._get_default_version()
-            logger.info(f"No version found in DynamoDB, using default: {default_version}")
+            logger.info("No version found in DynamoDB, using default: %s", default_version)
             return default_version
 
         except Exception as e:
-            logger.error(f"Error loading from DynamoDB: {e}")
+            logger.error("Error loading from DynamoDB: %s", e)
             # Fall back to default version
             return self._get_default_version()
 
@@ -128,46 +359,85 @@ class VersionManager:
         s3_key = f"{self.s3_prefix or 'versions'}/{self.repo_id}.json"
 
         try:
-            s3 = boto3.client('s3',
-                              aws_access_key_id=self.aws_access_key_id,
-                              aws_secret_access_key=self.aws_secret_access_key,
-                              aws_session_token=self.aws_session_token)
-
-            response = s3.get_object(Bucket=self.s3_bucket, Key=s3_key)
-            version_data = json.loads(response['Body'].read().decode('utf-8'))
-            logger.info(f"Loaded version from S3: {version_data}")
+            s3 = _get_s3_client(self._aws_credentials())
+            try:
+                response = s3.get_object(Bucket=self.s3_bucket, Key=s3_key)
+            except s3.exceptions.NoSuchKey:
+                # A new repo: there is no backup copy either
+                default_version = self._get_default_version()
+                logger.info("No version found in S3, using default: %s", default_version)
+                return default_version
+            except Exception as e:
+                # The primary copy is authoritative; the backup is only a failover
+                logger.warning("Error loading from S3, trying backup copy: %s", e)
+                response = s3.get_object(Bucket=self.s3_bucket, Key=f"{s3_key}.bak")
+            version_data = _json_loads(response['Body'].read())
+            logger.info("Loaded version from S3: %s", version_data)
+            self._cache_remote_load(version_data)
             return version_data
         except Exception as e:
-            logger.warning(f"Error loading from S3: {e}")
+            logger.warning("Error loading from S3: %s", e)
             # Create default version
             default_version = self._get_default_version()
-            logger.info(f"Using default version: {default_version}")
+            logger.info("Using default version: %s", default_version)
             return default_version
 
     def _get_default_version(self):
         """Get default version data."""
+        env = os.environ
         return {
-            "x": int(os.environ.get("VERSION_X", 1)),
-            "y": int(os.environ.get("VERSION_Y", 0)),
-            "z": int(os.environ.get("VERSION_Z", 0))
+            "x": int(env.get("VERSION_X", 1)),
+            "y": int(env.get("VERSION_Y", 0)),
+            "z": int(env.get("VERSION_Z", 0))
         }
 
     def save_version(self):
-        """Save version data to the configured storage."""
+        """
+        Save pending version changes to the configured storage.
+
+        Nothing is written unless a mutation method was called since the last
+        save and the version data actually differs from what was loaded.
+        """
+        if not self._pending:
+            logger.info("No pending version changes, skipping save")
+            return
+
+        version = self._version_tuple()
+        if version == self._loaded_version:
+            logger.info("Version unchanged, skipping save")
+            self._pending = False
+            return
+
         if self.storage_type == "file":
-            return self._save_to_file()
+            self._save_to_file()
         elif self.storage_type == "dynamodb":
-            return self._save_to_dynamodb()
+            self._save_to_dynamodb()
         elif self.storage_type == "s3":
-            return self._save_to_s3()
+            self._save_to_s3()
         else:
             raise ValueError(f"Unsupported storage type: {self.storage_type}")
+        _LOAD_CACHE.pop(self._cache_key(), None)
+        self._loaded_version = version
+        self._pending = False
+
+    def flush(self):
+        """Write any pending version changes in a single save."""
+        return self.save_version()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Only persist the batched changes if the block completed successfully
+        if exc_type is None:
+            self.flush()
+        return False
 
     def _save_to_file(self):
         """Save version to a local file."""
-        with open(self.version_file, 'w') as f:
-            json.dump(self.version_data, f, indent=2)
-        logger.info(f"Version saved to file: {self.version_data}")
+        with open(self.version_file, 'wb') as f:
+            f.write(_json_dumps(self._v.as_dict(), indent=True))
+        logger.info("Version saved to file: %s", self._v)
 
     def _save_to_dynamodb(self):
         """Save version to DynamoDB."""
@@ -175,20 +445,19 @@ class VersionManager:
             raise ValueError("DynamoDB table name is required for DynamoDB storage")
 
         try:
-            dynamodb = boto3.resource('dynamodb')
-            table = dynamodb.Table(self.dynamodb_table)
+            table = self._get_dynamodb_table()
 
             # Store version data with repo identifier
             item = {
                 'repo_id': self.repo_id,
-                'version_data': self.version_data,
-                'updated_at': datetime.now().isoformat()
+                'version_data': self._v.as_dict(),
+                'updated_at': _utc_timestamp()
             }
 
             table.put_item(Item=item)
-            logger.info(f"Version saved to DynamoDB: {self.version_data}")
+            logger.info("Version saved to DynamoDB: %s", self._v)
         except Exception as e:
-            logger.error(f"Error saving to DynamoDB: {e}")
+            logger.error("Error saving to DynamoDB: %s", e)
             # Fall back to file storage
             logger.info("Falling back to file storage")
             self._save_to_file()
@@ -201,64 +470,148 @@ class VersionManager:
         s3_key = f"{self.s3_prefix or 'versions'}/{self.repo_id}.json"
 
         try:
-            s3 = boto3.client('s3')
-            s3.put_object(
-                Bucket=self.s3_bucket,
-                Key=s3_key,
-                Body=json.dumps(self.version_data),
-                ContentType='application/json'
-            )
-            logger.info(f"Version saved to S3: {self.version_data}")
+            from concurrent.futures import ThreadPoolExecutor
+
+            s3 = _get_s3_client(self._aws_credentials())
+            body = _json_dumps(self._v.as_dict())
+
+            def write(key):
+                s3.put_object(
+                    Bucket=self.s3_bucket,
+                    Key=key,
+                    Body=body,
+                    ContentType='application/json'
+                )
+
+            # Write the primary and backup copies in parallel and wait for both
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                primary = executor.submit(write, s3_key)
+                backup = executor.submit(write, f"{s3_key}.bak")
+            backup_error = backup.exception()
+
+            # The backup must never hold a version the primary doesn't have
+            if primary.exception() is not None:
+                if backup_error is None:
+                    self._delete_s3_backup(s3, s3_key)
+                raise primary.exception()
+            if backup_error is not None:
+                logger.warning("Error saving S3 backup copy, removing it: %s", backup_error)
+                self._delete_s3_backup(s3, s3_key)
+            logger.info("Version saved to S3: %s", self._v)
         except Exception as e:
-            logger.error(f"Error saving to S3: {e}")
+            logger.error("Error saving to S3: %s", e)
             # Fall back to file storage
             logger.info("Falling back to file storage")
             self._save_to_file()
 
+    def _delete_s3_backup(self, s3, s3_key):
+        """Remove a backup copy that is out of step with the primary copy."""
+        try:
+            s3.delete_object(Bucket=self.s3_bucket, Key=f"{s3_key}.bak")
+        except Exception as e:
+            logger.error("Error removing stale S3 backup copy %s.bak: %s", s3_key, e)
+
     def get_version_string(self):
         """Get version as a string."""
-        return f"{self.version_data['x']}.{self.version_data['y']}.{self.version_data['z']}"
+        v = self._load()
+        return f"{v.x}.{v.y}.{v.z}"
 
     def increment_x(self):
         """Increment X value and reset Y and Z."""
-        self.version_data["x"] += 1
-        self.version_data["y"] = 0
-        self.version_data["z"] = 0
+        v = self._load()
+        v.x += 1
+        v.y = 0
+        v.z = 0
+        self._pending = True
         return self
 
     def increment_y(self):
         """Increment Y value and reset Z."""
-        self.version_data["y"] += 1
-        self.version_data["z"] = 0
+        v = self._load()
+        v.y += 1
+        v.z = 0
+        self._pending = True
         return self
 
     def increment_z(self):
         """Increment Z value."""
-        self.version_data["z"] += 1
+        self._load().z += 1
+        self._pending = True
+        return self
+
+    def increment_z_remote(self):
+        """
+        Increment Z and persist it in one step.
+
+        With DynamoDB storage this is a single atomic UpdateItem, which saves
+        the separate write and cannot lose increments made by concurrent
+        pipelines. Other storage types, pending local changes, or a missing
+        item fall back to increment_z() followed by save_version().
+        """
+        if self.storage_type != "dynamodb" or self._pending:
+            self.increment_z()
+            self.save_version()
+            return self
+
+        if not self.dynamodb_table:
+            raise ValueError("DynamoDB table name is required for DynamoDB storage")
+
+        from botocore.exceptions import ClientError
+
+        try:
+            table = self._get_dynamodb_table()
+            # ADD only works on top-level attributes, so use SET on the nested map
+            response = table.update_item(
+                Key={'repo_id': self.repo_id},
+                UpdateExpression='SET version_data.#z = version_data.#z + :one, '
+                                 'updated_at = :t',
+                ConditionExpression='attribute_exists(version_data.#z)',
+                ExpressionAttributeNames={'#z': 'z'},
+                ExpressionAttributeValues={':one': 1, ':t': _utc_timestamp()},
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            # The condition fails when nothing is stored for this repo yet
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.info("No version in DynamoDB yet, saving it with a full write")
+            else:
+                logger.warning("Atomic increment in DynamoDB failed: %s", e)
+            self.increment_z()
+            self.save_version()
+            return self
+        except Exception as e:
+            logger.warning("Atomic increment in DynamoDB failed: %s", e)
+            self.increment_z()
+            self.save_version()
+            return self
+
+        _LOAD_CACHE.pop(self._cache_key(), None)
+        self._v = self._version_from_storage(response['Attributes']['version_data'])
+        self._loaded_version = self._version_tuple()
+        logger.info("Version incremented in DynamoDB: %s", self._v)
         return self
 
     def reset_z(self):
         """Reset Z to 0."""
-        self.version_data["z"] = 0
+        self._load().z = 0
+        self._pending = True
         return self
 
     def set_version(self, x=None, y=None, z=None):
         """Set specific version components."""
+        v = self._load()
         if x is not None:
-            self.version_data["x"] = x
+            v.x = x
         if y is not None:
-            self.version_data["y"] = y
+            v.y = y
         if z is not None:
-            self.version_data["z"] = z
+            v.z = z
+        self._pending = True
         return self
 
     def generate_image_tag(self):
         """Generate full image tag with project name, commit hash, timestamp, and version."""
-        # Use repository slug if available, fallback to env var or default
-        project_name = os.environ.get("BITBUCKET_REPO_SLUG",
-                                      os.environ.get("PROJECT_NAME", "python-app"))
-        commit_hash = os.environ.get("BITBUCKET_COMMIT", "local")[:8]
-        timestamp = int(datetime.now().timestamp())
+        timestamp = int(time.time())
         version_str = self.get_version_string()
 
-        return f"{project_name}-{commit_hash}-{timestamp}-{version_str}"
+        return f"{self._project_name}-{self._commit_hash8}-{timestamp}-{version_str}"
@@ -0,0 +1,47 @@
+import io
+import sys
+import pytest
+from src.main import HELP, main, parse_args
+from src.version_manager import VersionManager
+
+
+def test_batch(tmp_path, monkeypatch, capsys):
+    version_file = tmp_path / "version.json"
+    monkeypatch.setattr(sys, "stdin", io.StringIO("increment y\n\nincrement z\nget-version\n"))
+    assert main(["--version-file", str(version_file), "--batch", "-"]) == 0
+    assert capsys.readouterr().out == "1.1.1\n"
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.1.1"
+
+
+def test_parse_args_flag_value_forms():
+    args = parse_args(["--increment=y", "--set-x", "3", "--storage-type=s3", "--get-tag"])
+    assert args.increment == "y"
+    assert args.set_x == 3
+    assert args.storage_type == "s3"
+    assert args.get_tag is True
+    assert args.reset_z is False
+    assert args.version_file is None
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["--version-file"], "argument --version-file: expected one argument"),
+    (["--version-file", "--get-tag"], "argument --version-file: expected one argument"),
+    (["--bogus"], "unrecognized arguments: --bogus"),
+    (["--increment", "w"], "argument --increment: invalid choice: 'w'"),
+    (["--set-x", "a"], "argument --set-x: invalid int value: 'a'"),
+    (["--reset-z=1"], "argument --reset-z: ignored explicit argument '1'"),
+])
+def test_parse_args_errors(argv, message, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(argv)
+    assert exc_info.value.code == 2
+    err = capsys.readouterr().err
+    assert err.startswith("usage: version-manager")
+    assert message in err
+
+
+def test_parse_args_help(capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        parse_args(["-h"])
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == HELP
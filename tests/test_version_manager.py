@@ -1,5 +1,13 @@
+import io
+import json
 import os
-from src.version_manager import VersionManager
+import boto3
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+import src.version_manager as version_manager_module
+from src.version_manager import VersionManager, _json_dumps
 
 
 def test_version_manager():
@@ -40,3 +48,301 @@ def test_image_tag():
     image_tag = version_manager.generate_image_tag()
     assert image_tag.startswith('python-app-local-')
     assert image_tag.endswith('-1.0.0')
+
+
+def test_save_skipped_when_unchanged(tmp_path):
+    version_file = tmp_path / "version.json"
+    version_manager = VersionManager(version_file=str(version_file))
+    version_manager.save_version()
+    assert not version_file.exists()
+
+    version_manager.increment_z()
+    version_manager.save_version()
+    assert version_file.exists()
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.0.1"
+
+
+def test_context_manager_saves_once(tmp_path):
+    version_file = tmp_path / "version.json"
+    with VersionManager(version_file=str(version_file)) as version_manager:
+        version_manager.increment_x()
+        version_manager.increment_y()
+        version_manager.increment_z()
+        assert not version_file.exists()
+
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "2.1.1"
+
+
+def test_load_cache_sees_file_changes(tmp_path):
+    version_file = tmp_path / "version.json"
+    VersionManager(version_file=str(version_file)).increment_z().save_version()
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.0.1"
+
+    VersionManager(version_file=str(version_file)).increment_y().save_version()
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.1.0"
+
+
+def test_lazy_load(tmp_path):
+    version_file = tmp_path / "version.json"
+    version_file.write_text('{"x": 4, "y": 5, "z": 6}')
+    version_manager = VersionManager(version_file=str(version_file), lazy_load=True)
+    version_file.write_text('{"x": 7, "y": 8, "z": 9}')
+    assert version_manager.get_version_string() == "7.8.9"
+
+
+def test_partial_version_data(tmp_path):
+    version_file = tmp_path / "version.json"
+    version_file.write_text('{"x": "2", "z": 5}')
+    version_manager = VersionManager(version_file=str(version_file))
+    assert version_manager.get_version_string() == "2.0.5"
+    version_manager.increment_z()
+    assert version_manager.get_version_string() == "2.0.6"
+
+
+def test_non_numeric_version_data(tmp_path):
+    version_file = tmp_path / "version.json"
+    version_file.write_text('{"x": "abc", "y": 1, "z": 2}')
+    version_manager = VersionManager(version_file=str(version_file))
+    assert version_manager.get_version_string() == "1.0.0"
+
+
+def _stubbed_dynamodb_manager():
+    dynamodb = boto3.resource('dynamodb', region_name='us-east-1',
+                              aws_access_key_id='testing', aws_secret_access_key='testing')
+    table = dynamodb.Table('versions')
+    version_manager = VersionManager(storage_type="dynamodb", dynamodb_table="versions",
+                                     lazy_load=True)
+    version_manager._dynamodb_table_obj = table
+    return version_manager, Stubber(table.meta.client)
+
+
+def test_increment_z_remote_update_item():
+    version_manager, stubber = _stubbed_dynamodb_manager()
+    stubber.add_response(
+        'update_item',
+        {'Attributes': {
+            'repo_id': {'S': version_manager.repo_id},
+            'version_data': {'M': {'x': {'N': '2'}, 'y': {'N': '3'}, 'z': {'N': '5'}}},
+        }},
+        {
+            'TableName': 'versions',
+            'Key': {'repo_id': version_manager.repo_id},
+            'UpdateExpression': 'SET version_data.#z = version_data.#z + :one, '
+                                'updated_at = :t',
+            'ConditionExpression': 'attribute_exists(version_data.#z)',
+            'ExpressionAttributeNames': {'#z': 'z'},
+            'ExpressionAttributeValues': {':one': 1, ':t': ANY},
+            'ReturnValues': 'ALL_NEW',
+        },
+    )
+    with stubber:
+        version_manager.increment_z_remote()
+    stubber.assert_no_pending_responses()
+    assert version_manager.get_version_string() == "2.3.5"
+
+
+def test_increment_z_remote_falls_back_without_stored_item():
+    version_manager, stubber = _stubbed_dynamodb_manager()
+    key = {'repo_id': version_manager.repo_id}
+    stubber.add_client_error('update_item',
+                             service_error_code='ConditionalCheckFailedException',
+                             http_status_code=400)
+    stubber.add_response('get_item', {
+        'Item': {
+            'repo_id': {'S': version_manager.repo_id},
+            'version_data': {'M': {'x': {'N': '2'}, 'y': {'N': '3'}, 'z': {'N': '4'}}},
+        }
+    }, {'TableName': 'versions', 'Key': key})
+    stubber.add_response('put_item', {}, {
+        'TableName': 'versions',
+        'Item': {
+            'repo_id': version_manager.repo_id,
+            'version_data': {'x': 2, 'y': 3, 'z': 5},
+            'updated_at': ANY,
+        },
+    })
+    with stubber:
+        version_manager.increment_z_remote()
+    stubber.assert_no_pending_responses()
+    assert version_manager.get_version_string() == "2.3.5"
+
+
+def _stubbed_s3_manager(monkeypatch):
+    s3 = boto3.client('s3', region_name='us-east-1',
+                      aws_access_key_id='testing', aws_secret_access_key='testing')
+    monkeypatch.setattr(version_manager_module, "_get_s3_client", lambda credentials: s3)
+    version_manager = VersionManager(storage_type="s3", s3_bucket="bucket", lazy_load=True)
+    key = f"versions/{version_manager.repo_id}.json"
+    return version_manager, Stubber(s3), key
+
+
+def _s3_body(data):
+    body = _json_dumps(data)
+    return {'Body': StreamingBody(io.BytesIO(body), len(body))}
+
+
+def _record_s3_writes(version_manager, monkeypatch, fail_keys=()):
+    """
+    Answer S3 writes locally, failing those for fail_keys, and record them.
+
+    Stubber can't be used here: it matches responses in call order, and the
+    primary and backup copies are written concurrently.
+    """
+    s3 = boto3.client('s3', region_name='us-east-1',
+                      aws_access_key_id='testing', aws_secret_access_key='testing')
+    monkeypatch.setattr(version_manager_module, "_get_s3_client", lambda credentials: s3)
+    calls = []
+
+    def record(model, params, context, **kwargs):
+        context['test_call'] = (model.name, params['Key'], params.get('Body'))
+
+    def respond(model, context, **kwargs):
+        calls.append(context['test_call'])
+        if context['test_call'][1] in fail_keys:
+            raise ClientError({'Error': {'Code': 'InternalError', 'Message': 'failed'}},
+                              model.name)
+        return AWSResponse(None, 200, {}, None), {}
+
+    for operation in ('PutObject', 'DeleteObject'):
+        s3.meta.events.register(f'before-parameter-build.s3.{operation}', record)
+        s3.meta.events.register(f'before-call.s3.{operation}', respond)
+    return calls
+
+
+def test_s3_save_writes_primary_and_backup(monkeypatch):
+    version_manager = VersionManager(storage_type="s3", s3_bucket="bucket", lazy_load=True)
+    key = f"versions/{version_manager.repo_id}.json"
+    calls = _record_s3_writes(version_manager, monkeypatch)
+    version_manager.version_data = {"x": 1, "y": 2, "z": 4}
+    version_manager.save_version()
+
+    body = _json_dumps({"x": 1, "y": 2, "z": 4})
+    assert sorted(calls) == [('PutObject', key, body), ('PutObject', f"{key}.bak", body)]
+
+
+def test_s3_save_removes_backup_it_could_not_update(monkeypatch):
+    version_manager = VersionManager(storage_type="s3", s3_bucket="bucket", lazy_load=True)
+    key = f"versions/{version_manager.repo_id}.json"
+    calls = _record_s3_writes(version_manager, monkeypatch, fail_keys=(f"{key}.bak",))
+    version_manager.version_data = {"x": 1, "y": 2, "z": 4}
+    version_manager.save_version()
+
+    assert calls[-1] == ('DeleteObject', f"{key}.bak", None)
+    assert sorted(name for name, _, _ in calls) == ['DeleteObject', 'PutObject', 'PutObject']
+
+
+def test_s3_save_failure_falls_back_to_file(tmp_path, monkeypatch):
+    version_file = tmp_path / "version.json"
+    version_manager = VersionManager(storage_type="s3", s3_bucket="bucket",
+                                     version_file=str(version_file), lazy_load=True)
+    key = f"versions/{version_manager.repo_id}.json"
+    calls = _record_s3_writes(version_manager, monkeypatch, fail_keys=(key,))
+    version_manager.version_data = {"x": 1, "y": 2, "z": 4}
+    version_manager.save_version()
+
+    # The backup was written but the primary wasn't, so the backup is removed
+    assert calls[-1] == ('DeleteObject', f"{key}.bak", None)
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.2.4"
+
+
+def test_s3_load_prefers_primary(monkeypatch):
+    version_manager, stubber, key = _stubbed_s3_manager(monkeypatch)
+    # Only the primary is stubbed; reading the backup would fail the stubber
+    stubber.add_response('get_object', _s3_body({"x": 1, "y": 0, "z": 9}),
+                         {'Bucket': 'bucket', 'Key': key})
+    with stubber:
+        assert version_manager.get_version_string() == "1.0.9"
+    stubber.assert_no_pending_responses()
+
+
+def test_s3_load_falls_back_to_backup(monkeypatch):
+    version_manager, stubber, key = _stubbed_s3_manager(monkeypatch)
+    stubber.add_client_error('get_object', service_error_code='InternalError',
+                             http_status_code=500)
+    stubber.add_response('get_object', _s3_body({"x": 1, "y": 0, "z": 3}),
+                         {'Bucket': 'bucket', 'Key': f"{key}.bak"})
+    with stubber:
+        assert version_manager.get_version_string() == "1.0.3"
+    stubber.assert_no_pending_responses()
+
+
+def test_version_data_writes_through(tmp_path):
+    version_file = tmp_path / "version.json"
+    version_manager = VersionManager(version_file=str(version_file))
+    version_manager.version_data["z"] = 5
+    assert version_manager.version_data == {"x": 1, "y": 0, "z": 5}
+    version_manager.save_version()
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "1.0.5"
+
+    version_manager.version_data = {"x": 3, "y": 2, "z": 1}
+    version_manager.save_version()
+    assert VersionManager(version_file=str(version_file)).get_version_string() == "3.2.1"
+
+
+def test_failed_remote_load_is_not_cached(monkeypatch):
+    monkeypatch.setattr(version_manager_module, "_LOAD_CACHE", {})
+    monkeypatch.setenv("VERSION_CACHE_TTL", "60")
+    version_manager, stubber = _stubbed_dynamodb_manager()
+    stubber.add_client_error('get_item', service_error_code='InternalServerError',
+                             http_status_code=500)
+    with stubber:
+        assert version_manager.get_version_string() == "1.0.0"
+
+    version_manager, stubber = _stubbed_dynamodb_manager()
+    stubber.add_response('get_item', {
+        'Item': {
+            'repo_id': {'S': version_manager.repo_id},
+            'version_data': {'M': {'x': {'N': '2'}, 'y': {'N': '3'}, 'z': {'N': '4'}}},
+        }
+    })
+    with stubber:
+        assert version_manager.get_version_string() == "2.3.4"
+    stubber.assert_no_pending_responses()
+
+
+def test_invalid_cache_ttl_disables_remote_cache(monkeypatch):
+    monkeypatch.setattr(version_manager_module, "_LOAD_CACHE", {})
+    monkeypatch.setenv("VERSION_CACHE_TTL", "abc")
+    version_manager, stubber = _stubbed_dynamodb_manager()
+    stubber.add_response('get_item', {})
+    with stubber:
+        assert version_manager.get_version_string() == "1.0.0"
+    stubber.assert_no_pending_responses()
+
+
+def test_changed_version_is_always_saved(tmp_path):
+    version_file = tmp_path / "version.json"
+    # -1 and -2 have the same hash() in CPython, so this must not compare hashes
+    for z in (-1, -2, 2 ** 61 - 2, -1):
+        VersionManager(version_file=str(version_file)).set_version(z=z).save_version()
+        assert VersionManager(version_file=str(version_file)).version_data["z"] == z
+
+
+def test_repo_id_follows_working_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("BITBUCKET_REPO_SLUG", raising=False)
+    for name in ("repo-a", "repo-b"):
+        (tmp_path / name).mkdir()
+        monkeypatch.chdir(tmp_path / name)
+        assert VersionManager(lazy_load=True).repo_id == name
+
+
+def test_s3_load_missing_key_skips_backup(monkeypatch):
+    version_manager, stubber, key = _stubbed_s3_manager(monkeypatch)
+    # Only the primary is stubbed; reading the backup would fail the stubber
+    stubber.add_client_error('get_object', service_error_code='NoSuchKey',
+                             http_status_code=404)
+    with stubber:
+        assert version_manager.get_version_string() == "1.0.0"
+    stubber.assert_no_pending_responses()
+
+
+def test_version_data_is_a_plain_dict_snapshot():
+    version_manager = VersionManager(lazy_load=True)
+    version_manager.version_data = {"x": 1, "y": 2, "z": 3}
+    version_data = version_manager.version_data
+    assert json.loads(json.dumps(version_data)) == {"x": 1, "y": 2, "z": 3}
+    assert version_data.copy() == {"x": 1, "y": 2, "z": 3}
+
+    version_manager.increment_z()
+    assert version_data == {"x": 1, "y": 2, "z": 3}
+    assert version_manager.version_data == {"x": 1, "y": 2, "z": 4}